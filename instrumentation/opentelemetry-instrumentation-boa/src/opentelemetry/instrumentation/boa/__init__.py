@@ -0,0 +1,144 @@
+# Copyright The OpenTelemetry Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+
+Usage
+-----
+
+The OpenTelemetry ``boa`` integration traces package builds and metadata
+parsing performed through `boa`_.
+
+.. _boa: https://pypi.org/project/boa/
+
+Usage
+-----
+
+.. code-block:: python
+
+    from boa.core.run_build import run_build
+    from opentelemetry.instrumentation.boa import BoaInstrumentor
+
+
+    BoaInstrumentor().instrument()
+
+    run_build(args)
+
+API
+---
+"""
+# pylint: disable=no-value-for-parameter
+
+import importlib
+import logging
+from typing import Collection
+
+from wrapt import wrap_function_wrapper as _wrap
+
+from opentelemetry.instrumentation.boa.package import _instruments
+from opentelemetry.instrumentation.boa.version import __version__
+from opentelemetry.instrumentation.conda_build import _tracing_disabled
+from opentelemetry.instrumentation.instrumentor import BaseInstrumentor
+from opentelemetry.instrumentation.utils import unwrap
+from opentelemetry.trace import SpanKind, get_tracer
+
+logger = logging.getLogger(__name__)
+
+# Bound once at import: ``SpanKind.INTERNAL`` is an enum attribute lookup
+# the interpreter cannot cache, and the wrappers pass it on every call.
+_INTERNAL = SpanKind.INTERNAL
+
+_SPAN_RUN_BUILD = "boa.run_build"
+_SPAN_PARSE_AGAIN = "boa.MetaData.parse_again"
+
+# Everything traced, as (module name, attribute, span name) rows.
+# _instrument and _uninstrument iterate the same table, so the wrap and
+# unwrap sets cannot drift apart.
+_WRAPS = (
+    ("boa.core.run_build", "run_build", _SPAN_RUN_BUILD),
+    ("boa.core.metadata", "MetaData.parse_again", _SPAN_PARSE_AGAIN),
+)
+
+# Mirrors the flag in ``opentelemetry.instrumentation.conda_build``: set
+# only when the configured tracer provider can record spans, checked at
+# the top of every wrapper so instrumented calls are pure pass-through
+# when tracing is effectively disabled.
+_TRACING_ENABLED = False
+
+
+class _SpanWrapper:
+    """Callable that traces a fixed span name around the wrapped call.
+
+    One instance per wrapped function, handed to wrapt in place of the
+    old closure factory.  ``__slots__`` keeps per-instance storage to
+    three pointers and makes the per-call attribute reads slot-descriptor
+    lookups; ``start_as_current_span`` and the span kind are resolved
+    once in ``__init__`` rather than on every call.
+    """
+
+    __slots__ = ("_start", "_name", "_kind")
+
+    def __init__(self, tracer, span_name):
+        self._start = tracer.start_as_current_span
+        self._name = span_name
+        self._kind = _INTERNAL
+
+    def __call__(self, wrapped, instance, args, kwargs):
+        if not _TRACING_ENABLED:
+            return wrapped(*args, **kwargs)
+        with self._start(self._name, kind=self._kind):
+            return wrapped(*args, **kwargs)
+
+
+class BoaInstrumentor(BaseInstrumentor):
+    """An instrumentor for boa
+
+    See `BaseInstrumentor`
+    """
+
+    def instrumentation_dependencies(self) -> Collection[str]:
+        return _instruments
+
+    def _instrument(self, **kwargs):
+        global _TRACING_ENABLED  # pylint: disable=global-statement
+        tracer_provider = kwargs.get("tracer_provider")
+        if _tracing_disabled(tracer_provider):
+            # No processor will ever see these spans; leave boa untouched
+            # instead of paying span setup/teardown per call.
+            _TRACING_ENABLED = False
+            return
+        _TRACING_ENABLED = True
+        tracer = get_tracer(
+            __name__,
+            __version__,
+            tracer_provider,
+        )
+
+        # The library imports live inside import_module so that merely
+        # importing this module (e.g. through instrumentor entry-point
+        # discovery) does not drag in the boa/conda_build dependency tree.
+        for mod_name, attr, span_name in _WRAPS:
+            module = importlib.import_module(mod_name)
+            _wrap(module, attr, _SpanWrapper(tracer, span_name))
+
+    def _uninstrument(self, **kwargs):
+        global _TRACING_ENABLED  # pylint: disable=global-statement
+        _TRACING_ENABLED = False
+        for mod_name, attr, _span_name in _WRAPS:
+            module = importlib.import_module(mod_name)
+            if "." in attr:
+                cls_name, method = attr.split(".", 1)
+                unwrap(getattr(module, cls_name), method)
+            else:
+                unwrap(module, attr)
@@ -0,0 +1,66 @@
+# Copyright The OpenTelemetry Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Stand-ins for boa used when the real library is absent.
+
+boa is distributed through conda channels, and the PyPI project named
+``boa`` is an unrelated package, so the tox environments cannot
+pip-install it.  These stand-in modules cover exactly the surface the
+instrumentor touches, which lets the wrapper tests run anywhere; the
+real library always wins when it is importable.
+"""
+
+import sys
+import types
+from importlib.util import find_spec
+
+
+def _install_boa_stubs():
+    if find_spec("boa") is not None:
+        return
+
+    boa = types.ModuleType("boa")
+    boa.__otel_test_stub__ = True
+
+    core = types.ModuleType("boa.core")
+
+    run_build_module = types.ModuleType("boa.core.run_build")
+
+    def run_build(*args, **kwargs):
+        return None
+
+    run_build_module.run_build = run_build
+
+    metadata = types.ModuleType("boa.core.metadata")
+
+    class MetaData:
+        """Just enough of ``MetaData`` for the instrumentor to wrap."""
+
+        # pylint: disable=no-self-use
+
+        def parse_again(self, *args, **kwargs):
+            return None
+
+    metadata.MetaData = MetaData
+
+    boa.core = core
+    core.run_build = run_build_module
+    core.metadata = metadata
+    sys.modules["boa"] = boa
+    sys.modules["boa.core"] = core
+    sys.modules["boa.core.run_build"] = run_build_module
+    sys.modules["boa.core.metadata"] = metadata
+
+
+_install_boa_stubs()
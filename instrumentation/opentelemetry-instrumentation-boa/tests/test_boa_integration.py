@@ -0,0 +1,58 @@
+# Copyright The OpenTelemetry Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import boa.core.run_build
+from wrapt import FunctionWrapper
+
+from opentelemetry import trace as trace_api
+from opentelemetry.instrumentation.boa import BoaInstrumentor
+from opentelemetry.test.test_base import TestBase
+
+# The conftest stand-ins have no installed boa distribution to satisfy
+# the dependency check, so skip it when running against them.
+_INSTRUMENT_KWARGS = (
+    {"skip_dep_check": True}
+    if getattr(boa, "__otel_test_stub__", False)
+    else {}
+)
+
+
+class TestBoaIntegration(TestBase):
+    def tearDown(self):
+        super().tearDown()
+        with self.disable_logging():
+            BoaInstrumentor().uninstrument()
+
+    def test_instrument_uninstrument(self):
+        instrumentation = BoaInstrumentor()
+        instrumentation.instrument(**_INSTRUMENT_KWARGS)
+        self.assertTrue(
+            isinstance(boa.core.run_build.run_build, FunctionWrapper)
+        )
+
+        instrumentation.uninstrument()
+        self.assertFalse(
+            isinstance(boa.core.run_build.run_build, FunctionWrapper)
+        )
+
+    def test_no_op_tracer_provider(self):
+        # With a no-op provider the instrumentor must not wrap anything;
+        # instrumented calls are plain boa calls.
+        BoaInstrumentor().instrument(
+            tracer_provider=trace_api.NoOpTracerProvider(),
+            **_INSTRUMENT_KWARGS,
+        )
+        self.assertFalse(
+            isinstance(boa.core.run_build.run_build, FunctionWrapper)
+        )
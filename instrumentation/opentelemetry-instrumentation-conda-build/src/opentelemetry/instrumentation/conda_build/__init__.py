@@ -0,0 +1,530 @@
+# Copyright The OpenTelemetry Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+
+Usage
+-----
+
+The OpenTelemetry ``conda_build`` integration traces recipe rendering,
+metadata parsing and package builds performed through `conda-build`_.
+
+.. _conda-build: https://pypi.org/project/conda-build/
+
+Usage
+-----
+
+.. code-block:: python
+
+    import conda_build.api
+    from opentelemetry.instrumentation.conda_build import CondaBuildInstrumentor
+
+
+    CondaBuildInstrumentor().instrument()
+
+    conda_build.api.build("path/to/recipe")
+
+A ``TRACEPARENT`` environment variable, if set, is used as the remote
+parent of the ``conda-build root process`` span so builds launched from a
+CI runner join the caller's trace.
+
+The high-frequency ``MetaData`` methods are sampled rather than traced
+per call: one span every ``OTEL_CONDA_BUILD_SAMPLE_RATE`` invocations
+(default ``100``), plus a span for any call slower than
+``OTEL_CONDA_BUILD_SLOW_THRESHOLD`` seconds (default ``0.05``).
+Sampled-out calls are recorded as timing events on the enclosing span,
+or — when no span is recording — counted and reported in a single
+``conda_build.sampled_calls`` span when the instrumentor is shut down.
+
+Recipe attributes (package name and recipe path) are opt-in via
+``OTEL_CONDA_BUILD_ATTRIBUTES=1``; the package name comes from
+``MetaData.dist()``, computed once per ``MetaData`` instance and
+recomputed after ``parse_again``.
+
+Passing ``span_exporter`` to ``instrument()`` attaches a
+``BatchSpanProcessor`` tuned for conda-build's bursty span pattern
+(``max_queue_size=4096``, ``schedule_delay_millis=1000``,
+``max_export_batch_size=256``, ``export_timeout_millis=10000``); each of
+those values can be overridden with the keyword argument of the same
+name.
+
+API
+---
+"""
+# pylint: disable=no-value-for-parameter
+
+import atexit
+import importlib
+import logging
+import os
+import time
+from typing import Collection, Optional
+
+from wrapt import wrap_function_wrapper as _wrap
+
+from opentelemetry import context, trace
+from opentelemetry.instrumentation.conda_build.package import _instruments
+from opentelemetry.instrumentation.conda_build.version import __version__
+from opentelemetry.instrumentation.instrumentor import BaseInstrumentor
+from opentelemetry.instrumentation.utils import unwrap
+from opentelemetry.trace import Span, SpanKind, get_tracer
+from opentelemetry.trace.propagation.tracecontext import (
+    TraceContextTextMapPropagator,
+)
+
+logger = logging.getLogger(__name__)
+
+ATTRIBUTE_CONDA_BUILD_PACKAGE_NAME = "conda_build.package_name"
+ATTRIBUTE_CONDA_BUILD_RECIPE_PATH = "conda_build.recipe_path"
+
+# Bound once at import: ``SpanKind.INTERNAL`` is an enum attribute lookup
+# the interpreter cannot cache, and the wrappers pass it on every call.
+_INTERNAL = SpanKind.INTERNAL
+
+_SPAN_ROOT = "conda-build root process"
+_SPAN_RENDER = "conda_build.api.render"
+_SPAN_BUILD = "conda_build.api.build"
+_SPAN_GET_CONTENTS = "conda_build.MetaData._get_contents"
+_SPAN_PARSE_AGAIN = "conda_build.MetaData.parse_again"
+_SPAN_GET_RECIPE_TEXT = "conda_build.MetaData.get_recipe_text"
+_SPAN_GET_OUTPUT_METADATA = "conda_build.MetaData.get_output_metadata"
+_SPAN_GET_USED_VARS = "conda_build.MetaData.get_used_vars"
+_SPAN_GET_ENV_DEPENDENCIES = "conda_build.render.get_env_dependencies"
+_SPAN_EXECUTE_DOWNLOAD_ACTIONS = "conda_build.render.execute_download_actions"
+_SPAN_GET_UPSTREAM_PINS = "conda_build.render.get_upstream_pins"
+_SPAN_ADD_UPSTREAM_PINS = "conda_build.render.add_upstream_pins"
+_SPAN_FINALIZE_METADATA = "conda_build.render.finalize_metadata"
+_SPAN_SAMPLED_CALLS = "conda_build.sampled_calls"
+
+# Set by ``CondaBuildInstrumentor._instrument`` only when the configured
+# tracer provider can actually record spans; every wrapper checks it first
+# so instrumented conda-build calls degrade to pure pass-through when
+# tracing is effectively disabled.
+_TRACING_ENABLED = False
+
+
+def _from_env(name, default, convert):
+    """Read `name` from the environment as `convert`, or `default`.
+
+    A malformed value must never break conda-build itself — this module
+    is imported during instrumentor entry-point discovery — so parse
+    failures are logged and the default wins.
+    """
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    try:
+        return convert(value)
+    except ValueError:
+        logger.warning(
+            "Invalid value %r for %s; using default %s", value, name, default
+        )
+        return default
+
+
+# The hot MetaData methods fire once per variant x output x reparse, so a
+# span per invocation floods the exporter queue for very little signal.
+# Only every Nth call gets a span; the rest are just timed, and a call is
+# still reported individually whenever it exceeds the slow threshold.
+# The rate is clamped to >= 1: the wrappers use it as a modulo divisor,
+# and zero would raise on every instrumented MetaData call.
+_SAMPLE_EVERY = max(1, _from_env("OTEL_CONDA_BUILD_SAMPLE_RATE", 100, int))
+_SLOW_THRESHOLD = _from_env("OTEL_CONDA_BUILD_SLOW_THRESHOLD", 0.05, float)
+
+# Recipe attributes (package name via MetaData.dist(), recipe path) are
+# opt-in: serializing them costs tens of microseconds per span even with
+# the per-instance dist() memo.
+_ATTRIBUTES_ENABLED = os.environ.get("OTEL_CONDA_BUILD_ATTRIBUTES") == "1"
+
+# span name -> calls that were sampled out with no recording parent to
+# attach an event to, reported as one summary span at teardown.
+_SKIPPED_CALLS = {}
+
+_get_current_span = trace.get_current_span
+
+
+def _tracing_disabled(tracer_provider) -> bool:
+    """Return True when no span ever leaves `tracer_provider`.
+
+    Covers an explicit ``NoOpTracerProvider`` as well as an SDK provider
+    that has no span processors registered; in both cases spans would be
+    created and torn down without being exported.
+    """
+    provider = tracer_provider or trace.get_tracer_provider()
+    if isinstance(provider, trace.NoOpTracerProvider):
+        return True
+    active = getattr(provider, "_active_span_processor", None)
+    if active is not None and not getattr(active, "_span_processors", True):
+        return True
+    return False
+
+
+class _SpanWrapper:
+    """Callable that traces a fixed span name around the wrapped call.
+
+    One instance per wrapped function, handed to wrapt in place of the
+    old closure factory.  ``__slots__`` keeps per-instance storage to a
+    few pointers and makes the per-call attribute reads slot-descriptor
+    lookups; ``start_as_current_span`` and the span kind are resolved
+    once in ``__init__`` rather than on every call.
+
+    `set_attributes`, when given, is called with ``(span, instance)``
+    for recording spans; it is ignored unless the opt-in
+    ``OTEL_CONDA_BUILD_ATTRIBUTES`` gate is on.
+    """
+
+    __slots__ = ("_start", "_name", "_kind", "_set_attrs")
+
+    def __init__(self, tracer, span_name, set_attributes=None):
+        self._start = tracer.start_as_current_span
+        self._name = span_name
+        self._kind = _INTERNAL
+        self._set_attrs = set_attributes if _ATTRIBUTES_ENABLED else None
+
+    def __call__(self, wrapped, instance, args, kwargs):
+        if not _TRACING_ENABLED:
+            return wrapped(*args, **kwargs)
+        with self._start(self._name, kind=self._kind) as span:
+            if self._set_attrs is not None and span.is_recording():
+                self._set_attrs(span, instance)
+            return wrapped(*args, **kwargs)
+
+
+def _wrap_build(tracer, instrumentor):
+    """Wrap `conda_build.api.build()`
+
+    ``api.build`` is the one true process entry point, so the root
+    process span is created lazily here on first invocation instead of
+    at ``instrument()`` time — render-only flows and instrumentors set
+    up in tests never allocate it.
+    """
+    _start = tracer.start_as_current_span
+
+    def wrapper(wrapped, instance, args, kwargs):
+        if not _TRACING_ENABLED:
+            return wrapped(*args, **kwargs)
+        if instrumentor.root_span is None:
+            instrumentor._start_root_span()
+        with _start(_SPAN_BUILD, kind=_INTERNAL):
+            return wrapped(*args, **kwargs)
+
+    return wrapper
+
+
+def _set_package_attributes(span, instance):
+    """Attach recipe attributes for `instance` to `span`.
+
+    ``MetaData.dist()`` re-renders Jinja to join name/version/build, far
+    too expensive to pay per span, so its result is memoized on the
+    instance; ``parse_again`` drops the memo because it mutates the
+    metadata.
+    """
+    dist = getattr(instance, "_otel_dist", None)
+    if dist is None:
+        dist = instance._otel_dist = instance.dist()
+    span.set_attribute(ATTRIBUTE_CONDA_BUILD_PACKAGE_NAME, dist)
+    if instance.meta_path:
+        span.set_attribute(
+            ATTRIBUTE_CONDA_BUILD_RECIPE_PATH, str(instance.meta_path)
+        )
+
+
+def _make_bound_wrapper(original, tracer, span_name, invalidates_cache=False):
+    """Trace `original` (an unbound ``MetaData`` method) by assignment.
+
+    ``MetaData._get_contents``, ``parse_again`` and ``get_used_vars``
+    fire hundreds of times per render; for those the ``ObjectProxy``
+    indirection wrapt puts in front of every call is measurable.  The
+    returned function is assigned directly onto the class and delegates
+    to `original`, bypassing ``ObjectProxy.__call__`` entirely.
+
+    Calls are sampled: every ``_SAMPLE_EVERY``-th invocation gets a real
+    span, sampled-out invocations are only timed and get a span after
+    the fact if they ran longer than ``_SLOW_THRESHOLD`` seconds.  The
+    rest become events on the already-active parent span — an event is
+    one timestamped record on an existing span, roughly an order of
+    magnitude cheaper than a span of its own since it needs no context
+    propagation or separate export framing.  Calls with no recording
+    parent are tallied in ``_SKIPPED_CALLS`` and reported as a single
+    summary span at uninstrumentation.
+
+    Pass ``invalidates_cache=True`` for methods that mutate the metadata
+    (``parse_again``) so the memoized ``dist()`` attribute value is
+    recomputed afterwards.
+
+    Everything the sampled-out fast path touches except the mutable
+    ``_TRACING_ENABLED`` flag is bound to closure cells here, so the
+    per-call body runs on LOAD_DEREF/LOAD_FAST instead of module-global
+    and ``time`` attribute lookups.
+    """
+    _start = tracer.start_as_current_span
+    _start_span = tracer.start_span
+    _perf_counter = time.perf_counter
+    _time_ns = time.time_ns
+    sample_every = _SAMPLE_EVERY
+    slow_threshold = _SLOW_THRESHOLD
+    skipped_calls = _SKIPPED_CALLS
+    count = 0
+
+    def wrapper(self, *args, **kwargs):
+        nonlocal count
+        if not _TRACING_ENABLED:
+            return original(self, *args, **kwargs)
+        count += 1
+        if count % sample_every:
+            start_ns = _time_ns()
+            t_0 = _perf_counter()
+            result = original(self, *args, **kwargs)
+            if invalidates_cache:
+                self.__dict__.pop("_otel_dist", None)
+            elapsed = _perf_counter() - t_0
+            if elapsed >= slow_threshold:
+                _start_span(
+                    span_name, kind=_INTERNAL, start_time=start_ns
+                ).end()
+            else:
+                parent = _get_current_span()
+                if parent.is_recording():
+                    parent.add_event(
+                        span_name,
+                        {"duration_ns": int(elapsed * 1e9)},
+                    )
+                else:
+                    skipped_calls[span_name] = (
+                        skipped_calls.get(span_name, 0) + 1
+                    )
+            return result
+        with _start(span_name, kind=_INTERNAL) as span:
+            if _ATTRIBUTES_ENABLED and span.is_recording():
+                _set_package_attributes(span, self)
+            result = original(self, *args, **kwargs)
+            if invalidates_cache:
+                self.__dict__.pop("_otel_dist", None)
+            return result
+
+    return wrapper
+
+
+# Everything traced through wrapt, as (module name, attribute, span
+# name, attribute setter) rows.  _instrument and _uninstrument iterate
+# the same table, so the wrap and unwrap sets cannot drift apart.
+# ``api.build`` is wrapped separately because its wrapper also owns lazy
+# root-span creation, and the hot MetaData methods are direct-patched
+# from ``_PATCHED_METHODS`` instead.
+_WRAPS = (
+    ("conda_build.api", "render", _SPAN_RENDER, None),
+    (
+        "conda_build.metadata",
+        "MetaData.get_output_metadata",
+        _SPAN_GET_OUTPUT_METADATA,
+        _set_package_attributes,
+    ),
+    (
+        "conda_build.render",
+        "get_env_dependencies",
+        _SPAN_GET_ENV_DEPENDENCIES,
+        None,
+    ),
+    (
+        "conda_build.render",
+        "execute_download_actions",
+        _SPAN_EXECUTE_DOWNLOAD_ACTIONS,
+        None,
+    ),
+    (
+        "conda_build.render",
+        "get_upstream_pins",
+        _SPAN_GET_UPSTREAM_PINS,
+        None,
+    ),
+    (
+        "conda_build.render",
+        "add_upstream_pins",
+        _SPAN_ADD_UPSTREAM_PINS,
+        None,
+    ),
+    (
+        "conda_build.render",
+        "finalize_metadata",
+        _SPAN_FINALIZE_METADATA,
+        None,
+    ),
+)
+
+# The hot MetaData methods patched by direct assignment, as (attribute,
+# span name, whether the method invalidates the dist() memo) rows.
+_PATCHED_METHODS = (
+    ("_get_contents", _SPAN_GET_CONTENTS, False),
+    ("parse_again", _SPAN_PARSE_AGAIN, True),
+    ("get_recipe_text", _SPAN_GET_RECIPE_TEXT, False),
+    ("get_used_vars", _SPAN_GET_USED_VARS, False),
+)
+
+
+class CondaBuildInstrumentor(BaseInstrumentor):
+    """An instrumentor for conda-build
+
+    See `BaseInstrumentor`
+    """
+
+    root_span: Optional[Span] = None
+    _batch_processor = None
+
+    def instrumentation_dependencies(self) -> Collection[str]:
+        return _instruments
+
+    def _attach_batch_processor(self, tracer_provider, kwargs):
+        """Attach a tuned ``BatchSpanProcessor`` for ``span_exporter``.
+
+        The provider has no API to remove a processor, so attach one
+        processor per instrumentor lifetime and keep reusing it: repeat
+        instrument()/uninstrument() cycles must neither stack duplicates
+        that re-export every span nor strand dead processors on the
+        (often global) provider.
+        """
+        span_exporter = kwargs.get("span_exporter")
+        if span_exporter is None or self._batch_processor is not None:
+            return
+        provider = tracer_provider or trace.get_tracer_provider()
+        if hasattr(provider, "add_span_processor"):
+            # Metadata reparse storms on multi-output recipes are
+            # bursty; the stock 2048-entry queue drained every 5s
+            # drops spans, so default to a deeper queue flushed in
+            # smaller, more frequent batches.
+            # pylint: disable-next=import-outside-toplevel
+            from opentelemetry.sdk.trace.export import BatchSpanProcessor
+
+            self._batch_processor = BatchSpanProcessor(
+                span_exporter,
+                max_queue_size=kwargs.get("max_queue_size", 4096),
+                schedule_delay_millis=kwargs.get(
+                    "schedule_delay_millis", 1000
+                ),
+                max_export_batch_size=kwargs.get("max_export_batch_size", 256),
+                export_timeout_millis=kwargs.get(
+                    "export_timeout_millis", 10000
+                ),
+            )
+            provider.add_span_processor(self._batch_processor)
+
+    def _instrument(self, **kwargs):
+        global _TRACING_ENABLED  # pylint: disable=global-statement
+        tracer_provider = kwargs.get("tracer_provider")
+        self._attach_batch_processor(tracer_provider, kwargs)
+        if _tracing_disabled(tracer_provider):
+            # No processor will ever see these spans; leave conda-build
+            # untouched instead of paying span setup/teardown per call.
+            _TRACING_ENABLED = False
+            return
+        _TRACING_ENABLED = True
+        tracer = get_tracer(
+            __name__,
+            __version__,
+            tracer_provider,
+        )
+
+        # pylint: disable=attribute-defined-outside-init
+        self._tracer = tracer
+
+        # Only pay for propagator construction and header parsing when a
+        # caller actually handed us a trace context; CLI invocations
+        # without TRACEPARENT skip straight to a local root span.
+        traceparent = os.environ.get("TRACEPARENT")
+        self._ctx = (
+            TraceContextTextMapPropagator().extract(
+                {"traceparent": traceparent}
+            )
+            if traceparent
+            else None
+        )
+        # conda-build processes rarely call uninstrument() before
+        # exiting; make sure the root span is ended (and flushed by the
+        # processor's own shutdown hook) even on a hard exit.
+        atexit.register(self._end_root_span)
+
+        # The library imports live inside import_module so that merely
+        # importing this module (e.g. through instrumentor entry-point
+        # discovery) does not drag in the conda_build dependency tree.
+        for mod_name, attr, span_name, set_attrs in _WRAPS:
+            module = importlib.import_module(mod_name)
+            _wrap(module, attr, _SpanWrapper(tracer, span_name, set_attrs))
+        api = importlib.import_module("conda_build.api")
+        _wrap(api, "build", _wrap_build(tracer, self))
+
+        # The hottest MetaData methods are patched by direct assignment
+        # rather than through wrapt, so per-call dispatch skips the
+        # ObjectProxy layer.  _uninstrument restores the originals.
+        metadata_cls = importlib.import_module("conda_build.metadata").MetaData
+        self._original_methods = {}
+        for attr, span_name, invalidates_cache in _PATCHED_METHODS:
+            original = getattr(metadata_cls, attr)
+            self._original_methods[attr] = original
+            setattr(
+                metadata_cls,
+                attr,
+                _make_bound_wrapper(
+                    original,
+                    tracer,
+                    span_name,
+                    invalidates_cache=invalidates_cache,
+                ),
+            )
+
+    def _uninstrument(self, **kwargs):
+        # pylint: disable=attribute-defined-outside-init
+        global _TRACING_ENABLED  # pylint: disable=global-statement
+        if _TRACING_ENABLED and _SKIPPED_CALLS:
+            # One summary span accounts for everything the sampler
+            # dropped, so call counts stay reconstructable downstream.
+            with self._tracer.start_as_current_span(
+                _SPAN_SAMPLED_CALLS, kind=_INTERNAL
+            ) as span:
+                if span.is_recording():
+                    for span_name, count in _SKIPPED_CALLS.items():
+                        span.set_attribute(span_name, count)
+            _SKIPPED_CALLS.clear()
+        _TRACING_ENABLED = False
+        atexit.unregister(self._end_root_span)
+        self._end_root_span()
+        for mod_name, attr, _span_name, _set_attrs in _WRAPS:
+            module = importlib.import_module(mod_name)
+            if "." in attr:
+                cls_name, method = attr.split(".", 1)
+                unwrap(getattr(module, cls_name), method)
+            else:
+                unwrap(module, attr)
+        api = importlib.import_module("conda_build.api")
+        unwrap(api, "build")
+        metadata_cls = importlib.import_module("conda_build.metadata").MetaData
+        for attr, original in getattr(self, "_original_methods", {}).items():
+            setattr(metadata_cls, attr, original)
+        self._original_methods = {}
+        # Flush the processor we attached but keep it alive: it cannot
+        # be detached from the provider, so shutting it down would spray
+        # "already shutdown" warnings over every later span on the
+        # shared provider, and the non-None handle lets the next
+        # instrument() reuse it instead of stacking another one.
+        if self._batch_processor is not None:
+            self._batch_processor.force_flush()
+
+    def _start_root_span(self):
+        # pylint: disable=attribute-defined-outside-init
+        self.root_span = self._tracer.start_span(_SPAN_ROOT, context=self._ctx)
+        self._token = context.attach(trace.set_span_in_context(self.root_span))
+
+    def _end_root_span(self):
+        if self.root_span is not None:
+            context.detach(self._token)
+            self.root_span.end()
+            self.root_span = None
@@ -0,0 +1,110 @@
+# Copyright The OpenTelemetry Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Stand-ins for conda-build used when the real library is absent.
+
+conda-build is distributed through conda channels rather than PyPI, so
+the tox environments cannot pip-install it.  These stand-in modules
+cover exactly the surface the instrumentor touches, which lets the
+wrapper and sampling tests run anywhere; the real library always wins
+when it is importable, and tests that drive the stand-in ``MetaData``
+directly skip themselves when it is.
+"""
+
+import sys
+import types
+from importlib.util import find_spec
+
+
+def _install_conda_build_stubs():
+    if find_spec("conda_build") is not None:
+        return
+
+    conda_build = types.ModuleType("conda_build")
+    conda_build.__otel_test_stub__ = True
+
+    api = types.ModuleType("conda_build.api")
+
+    def render(*args, **kwargs):
+        return []
+
+    def build(*args, **kwargs):
+        return []
+
+    api.render = render
+    api.build = build
+
+    metadata = types.ModuleType("conda_build.metadata")
+
+    class MetaData:
+        """Just enough of ``MetaData`` for the instrumentor to patch."""
+
+        # pylint: disable=no-self-use
+
+        def __init__(self, path="meta.yaml"):
+            self.meta_path = path
+
+        def dist(self):
+            return "pkg-1.0-0"
+
+        def _get_contents(self, *args, **kwargs):
+            return ""
+
+        def parse_again(self, *args, **kwargs):
+            return None
+
+        def get_recipe_text(self, *args, **kwargs):
+            return ""
+
+        def get_output_metadata(self, *args, **kwargs):
+            return self
+
+        def get_used_vars(self, *args, **kwargs):
+            return set()
+
+    metadata.MetaData = MetaData
+
+    render_module = types.ModuleType("conda_build.render")
+
+    def get_env_dependencies(*args, **kwargs):
+        return []
+
+    def execute_download_actions(*args, **kwargs):
+        return None
+
+    def get_upstream_pins(*args, **kwargs):
+        return []
+
+    def add_upstream_pins(*args, **kwargs):
+        return None
+
+    def finalize_metadata(*args, **kwargs):
+        return None
+
+    render_module.get_env_dependencies = get_env_dependencies
+    render_module.execute_download_actions = execute_download_actions
+    render_module.get_upstream_pins = get_upstream_pins
+    render_module.add_upstream_pins = add_upstream_pins
+    render_module.finalize_metadata = finalize_metadata
+
+    conda_build.api = api
+    conda_build.metadata = metadata
+    conda_build.render = render_module
+    sys.modules["conda_build"] = conda_build
+    sys.modules["conda_build.api"] = api
+    sys.modules["conda_build.metadata"] = metadata
+    sys.modules["conda_build.render"] = render_module
+
+
+_install_conda_build_stubs()
@@ -0,0 +1,160 @@
+# Copyright The OpenTelemetry Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import conda_build.api
+import conda_build.metadata
+from wrapt import BoundFunctionWrapper, FunctionWrapper
+
+from opentelemetry import trace as trace_api
+from opentelemetry.instrumentation import conda_build as conda_build_instr
+from opentelemetry.instrumentation.conda_build import CondaBuildInstrumentor
+from opentelemetry.test.test_base import TestBase
+
+_STUBBED = getattr(conda_build, "__otel_test_stub__", False)
+
+# The conftest stand-ins have no installed conda-build distribution to
+# satisfy the dependency check, so skip it when running against them.
+_INSTRUMENT_KWARGS = {"skip_dep_check": True} if _STUBBED else {}
+
+
+class TestCondaBuildIntegration(TestBase):
+    def tearDown(self):
+        super().tearDown()
+        with self.disable_logging():
+            CondaBuildInstrumentor().uninstrument()
+
+    def test_instrument_uninstrument(self):
+        original_parse_again = conda_build.metadata.MetaData.parse_again
+
+        instrumentation = CondaBuildInstrumentor()
+        instrumentation.instrument(**_INSTRUMENT_KWARGS)
+        self.assertTrue(isinstance(conda_build.api.build, FunctionWrapper))
+        # Hot MetaData methods are patched by direct assignment, not wrapt
+        self.assertIsNot(
+            conda_build.metadata.MetaData.parse_again, original_parse_again
+        )
+        self.assertFalse(
+            isinstance(
+                conda_build.metadata.MetaData.parse_again,
+                BoundFunctionWrapper,
+            )
+        )
+
+        instrumentation.uninstrument()
+        self.assertFalse(isinstance(conda_build.api.build, FunctionWrapper))
+        self.assertIs(
+            conda_build.metadata.MetaData.parse_again, original_parse_again
+        )
+
+    def test_no_op_tracer_provider(self):
+        # With a no-op provider the instrumentor must not wrap anything;
+        # instrumented calls are plain conda-build calls.
+        original_parse_again = conda_build.metadata.MetaData.parse_again
+        CondaBuildInstrumentor().instrument(
+            tracer_provider=trace_api.NoOpTracerProvider(),
+            **_INSTRUMENT_KWARGS,
+        )
+        self.assertFalse(isinstance(conda_build.api.build, FunctionWrapper))
+        self.assertIs(
+            conda_build.metadata.MetaData.parse_again, original_parse_again
+        )
+
+
+@unittest.skipUnless(
+    _STUBBED,
+    "drives the stand-in MetaData directly; needs no real conda-build",
+)
+class TestCondaBuildSampling(TestBase):
+    # The sampling knobs are bound to closure cells at instrument()
+    # time, so each test overrides the module values before
+    # instrumenting and tearDown restores them.
+    # pylint: disable=protected-access
+
+    def setUp(self):
+        super().setUp()
+        self._saved_knobs = (
+            conda_build_instr._SAMPLE_EVERY,
+            conda_build_instr._SLOW_THRESHOLD,
+        )
+
+    def tearDown(self):
+        super().tearDown()
+        with self.disable_logging():
+            CondaBuildInstrumentor().uninstrument()
+        (
+            conda_build_instr._SAMPLE_EVERY,
+            conda_build_instr._SLOW_THRESHOLD,
+        ) = self._saved_knobs
+        conda_build_instr._SKIPPED_CALLS.clear()
+
+    def _instrument_sampling(self, sample_every, slow_threshold):
+        conda_build_instr._SAMPLE_EVERY = sample_every
+        conda_build_instr._SLOW_THRESHOLD = slow_threshold
+        CondaBuildInstrumentor().instrument(
+            tracer_provider=self.tracer_provider, **_INSTRUMENT_KWARGS
+        )
+
+    def test_every_nth_call_gets_a_span(self):
+        self._instrument_sampling(sample_every=5, slow_threshold=3600.0)
+        meta = conda_build.metadata.MetaData()
+        for _ in range(20):
+            meta.parse_again()
+        spans = self.memory_exporter.get_finished_spans()
+        self.assertEqual(len(spans), 20 // 5)
+        for span in spans:
+            self.assertEqual(span.name, "conda_build.MetaData.parse_again")
+
+    def test_sampled_out_calls_become_parent_events(self):
+        self._instrument_sampling(sample_every=1000, slow_threshold=3600.0)
+        tracer = self.tracer_provider.get_tracer(__name__)
+        meta = conda_build.metadata.MetaData()
+        with tracer.start_as_current_span("parent"):
+            for _ in range(3):
+                meta.parse_again()
+        spans = self.memory_exporter.get_finished_spans()
+        self.assertEqual(len(spans), 1)
+        parent = spans[0]
+        self.assertEqual(parent.name, "parent")
+        self.assertEqual(len(parent.events), 3)
+        for event in parent.events:
+            self.assertEqual(event.name, "conda_build.MetaData.parse_again")
+            self.assertGreaterEqual(event.attributes["duration_ns"], 0)
+
+    def test_slow_sampled_out_calls_get_spans(self):
+        self._instrument_sampling(sample_every=1000, slow_threshold=0.0)
+        meta = conda_build.metadata.MetaData()
+        for _ in range(3):
+            meta.parse_again()
+        spans = self.memory_exporter.get_finished_spans()
+        self.assertEqual(len(spans), 3)
+        for span in spans:
+            self.assertEqual(span.name, "conda_build.MetaData.parse_again")
+            self.assertLessEqual(span.start_time, span.end_time)
+
+    def test_unparented_skips_reported_in_summary_span(self):
+        self._instrument_sampling(sample_every=1000, slow_threshold=3600.0)
+        meta = conda_build.metadata.MetaData()
+        for _ in range(7):
+            meta.parse_again()
+        self.assertEqual(len(self.memory_exporter.get_finished_spans()), 0)
+        CondaBuildInstrumentor().uninstrument()
+        spans = self.memory_exporter.get_finished_spans()
+        self.assertEqual(len(spans), 1)
+        summary = spans[0]
+        self.assertEqual(summary.name, "conda_build.sampled_calls")
+        self.assertEqual(
+            summary.attributes["conda_build.MetaData.parse_again"], 7
+        )
@@ -58,7 +58,15 @@ gen_path = os.path.join(
 # in all environments. Instead, users who need AWS Lambda support can opt-in
 # by manually adding it to their environment.
 # See https://github.com/open-telemetry/opentelemetry-python-contrib/issues/2787
-packages_to_exclude = ["opentelemetry-instrumentation-aws-lambda"]
+# boa and conda-build are excluded because both libraries are distributed
+# through conda channels rather than PyPI (the PyPI project named "boa" is
+# unrelated), so bootstrap could never pip-install their instrumentations'
+# targets.
+packages_to_exclude = [
+    "opentelemetry-instrumentation-aws-lambda",
+    "opentelemetry-instrumentation-boa",
+    "opentelemetry-instrumentation-conda-build",
+]
 
 
 def main():